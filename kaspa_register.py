@@ -1,19 +1,47 @@
 # kaspa_register.py
-from flask import Flask, request, render_template, jsonify, make_response, redirect, url_for, Response
+from flask import Flask, request, render_template, make_response, redirect, url_for, Response
 import os
+import sys
+import hashlib
 import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timezone
 try:
     import requests
 except Exception:
     requests = None
+try:
+    import orjson
+except Exception:
+    orjson = None
 import threading
 import time
+import atexit
+import random
+from collections import namedtuple
+from functools import lru_cache
+from types import SimpleNamespace
 from urllib.parse import quote_plus
 import board, digitalio
 
 
-# Own the reset line (RSTPD_N, active-low). Keep it OFF at boot.
+# Diagnostics from the write path are enqueued; a listener thread does the
+# blocking stdout I/O so it never lands inside the timed NFC window.
+# KASPA_LOGLEVEL=WARNING silences the per-write info lines.
+logger = logging.getLogger("kaspa")
+logger.setLevel(os.environ.get("KASPA_LOGLEVEL", "INFO").upper())
+logger.propagate = False
+_log_q = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_q))
+_log_listener = QueueListener(_log_q, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+
+
+# Own the reset line (RSTPD_N, active-low). Held low until pn532_boot()
+# releases it; between writes only the RF field is switched off, and the
+# line is only pulled again to recover from a driver error.
 _rst_pin = digitalio.DigitalInOut(board.D25)
 _rst_pin.direction = digitalio.Direction.OUTPUT
 _rst_pin.value = False  # hold PN532 in reset so it can't interfere
@@ -24,26 +52,33 @@ _ready_led = digitalio.DigitalInOut(board.D13)
 _ready_led.direction = digitalio.Direction.OUTPUT
 _ready_led.value = False
 
-# Timer to auto-turn off the LED after a delay
-_led_lock = threading.Lock()
-_led_timer = None
-
-def _led_off():
-    global _led_timer
-    with _led_lock:
-        _ready_led.value = False
-        _led_timer = None
+# Auto-OFF deadline (time.monotonic()) watched by one long-lived worker;
+# extending the timeout just moves the deadline, no thread per call.
+_led_cv = threading.Condition()
+_led_deadline = 0.0  # 0 = no pending auto-OFF
+
+def _led_worker():
+    global _led_deadline
+    with _led_cv:
+        while True:
+            while _led_deadline == 0.0:
+                _led_cv.wait()
+            remaining = _led_deadline - time.monotonic()
+            if remaining > 0:
+                _led_cv.wait(remaining)
+                continue  # deadline may have moved while we waited
+            _ready_led.value = False
+            _led_deadline = 0.0
 
 def _led_on_timed(seconds: float = 30.0):
     """Turn LED ON now; auto-OFF after `seconds`."""
-    global _led_timer
-    with _led_lock:
-        if _led_timer is not None:
-            _led_timer.cancel()
+    global _led_deadline
+    with _led_cv:
         _ready_led.value = True
-        _led_timer = threading.Timer(seconds, _led_off)
-        _led_timer.daemon = True
-        _led_timer.start()
+        _led_deadline = time.monotonic() + seconds
+        _led_cv.notify()
+
+threading.Thread(target=_led_worker, daemon=True).start()
 
 # Use your local module exactly like test_ntag_writer.py
 from ntag_writer import (
@@ -52,10 +87,72 @@ from ntag_writer import (
     Ntag21xWriter,
     NfcError,
     NDEFWriterError,
+    _VALID_CAPACITIES,
+    _FIRST_USER_PAGE,
+    _LAST_PAGE_BY_CAP,
 )
 
+# Pure builders keyed by their inputs; status polls and repeat writes hit the cache
+@lru_cache(maxsize=8)
+def _qp(v: str) -> str:
+    return quote_plus(v)
+
+@lru_cache(maxsize=32)
+def _build_uri(address: str, amount: str, message: str) -> str:
+    # kaspa:... ?amount=KAS_AMOUNT&label=<message>&message=<message>
+    sep = '&' if '?' in address else '?'
+    # label and message carry the same text: encode it once
+    msg_enc = _qp(message)
+    return f'{address}{sep}amount={_qp(amount)}&label={msg_enc}&message={msg_enc}'
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('KASPA_SECRET', 'change-me')
+app.config['PROPAGATE_EXCEPTIONS'] = True  # let the WSGI server log tracebacks
+
+# Templates don't change on the device: skip the per-render stat() and
+# compile them now so the first request doesn't pay for it.
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+for _tmpl in ("base.html", "index.html", "admin.html", "_status.html", "_status_simple.html"):
+    try:
+        app.jinja_env.get_template(_tmpl)
+    except Exception as e:
+        # Missing partials are handled by the inline status fallback
+        logger.warning("⚠️ Template preload failed: %s: %s", _tmpl, e)
+
+# The status partial is rendered straight from its compiled template: it
+# needs no request/app context, so skip render_template's context push.
+try:
+    _STATUS_TMPL = app.jinja_env.get_template("_status.html")
+except Exception:
+    _STATUS_TMPL = None  # inline fallback (already logged above)
+
+# Static files only change on deploy: let browsers keep them for a year and
+# bust the cache with a content hash in the URL (?v=...).
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 60 * 60 * 24 * 365
+
+def _static_version() -> str:
+    h = hashlib.md5()
+    for root, _dirs, files in sorted(os.walk(app.static_folder)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            h.update(os.path.relpath(path, app.static_folder).encode())
+            with open(path, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()[:8]
+
+_asset_version = _static_version()
+
+@app.context_processor
+def _inject_asset_version():
+    return {"asset_version": _asset_version}
+
+@app.after_request
+def _immutable_static(rsp):
+    # Only versioned URLs are safe to pin; a bare /static/... may change under it
+    if request.endpoint == "static" and request.args.get("v") == _asset_version:
+        rsp.cache_control.immutable = True
+    return rsp
 
 # Settings persisted to a JSON file
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'settings.json')
@@ -67,14 +164,22 @@ def _load_settings():
     except Exception:
         return {}
 
-def _save_settings(data: dict):
-    try:
-        tmp = CONFIG_PATH + '.tmp'
+def _save_json(path: str, data: dict):
+    # tmp + replace so a crash never leaves a half-written file
+    tmp = path + '.tmp'
+    if orjson is not None:
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(data))
+    else:
         with open(tmp, 'w') as f:
             json.dump(data, f)
-        os.replace(tmp, CONFIG_PATH)
+    os.replace(tmp, path)
+
+def _save_settings(data: dict):
+    try:
+        _save_json(CONFIG_PATH, data)
     except Exception as e:
-        print('⚠️ Failed to save settings:', e)
+        logger.warning("⚠️ Failed to save settings: %s", e)
 
 _file_settings = _load_settings()
 
@@ -87,207 +192,371 @@ config = {
     "verify": False,
     "assume_present": True,    # <-- glued tag: skip waiting loops
     "poll_timeout": 0.05,      # <-- when we DO wait, keep it short
+    "spi_baudrate": 5_000_000, # PN532 SPI max per datasheet
+    "profile": False,          # log per-write timings (detect/write/verify)
     "message": "Thanks!!!",
 }
 
 # --- Conversion rate (AUD -> KAS) ---
+# Last good rate + ETag persisted next to settings.json so a restart shows a
+# rate immediately and the next fetch can be a conditional (304) request.
+RATE_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'rate_cache.json')
+
+# _rate_lock only serializes writers. Readers load the globals directly:
+# each is rebound as a whole object (float / datetime), and under the GIL a
+# global load/store is atomic, so a reader sees the old or the new value.
 _rate_lock = threading.Lock()
 _rate_aud_per_kas = None  # float or None
 _rate_updated = None      # datetime or None
+_rate_etag = None         # ETag of the last 200 response
 
-def fetch_rate_once():
-    global _rate_aud_per_kas, _rate_updated
+def _make_rate_session():
+    """Keep-alive session; transient 429/5xx are retried in-fetch before our own backoff kicks in."""
     if requests is None:
-        return
+        return None
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    s = requests.Session()
+    s.mount('https://', HTTPAdapter(max_retries=Retry(
+        total=3,
+        backoff_factor=1.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=('GET',),
+    )))
+    return s
+
+_rate_session = _make_rate_session()
+
+def _load_rate_cache():
+    global _rate_aud_per_kas, _rate_updated, _rate_etag
+    try:
+        with open(RATE_CACHE_PATH, 'r') as f:
+            data = json.load(f)
+        rate = float(data.get('rate'))
+        if rate > 0:
+            _rate_aud_per_kas = rate
+            _rate_updated = datetime.fromisoformat(data['updated_at'])
+            _rate_etag = data.get('etag')
+    except Exception:
+        pass
+
+_load_rate_cache()
+
+def fetch_rate_once() -> bool:
+    """Fetch once; True if we now hold a fresh (or confirmed-unchanged) rate."""
+    global _rate_aud_per_kas, _rate_updated, _rate_etag
+    if requests is None:
+        return False
     try:
         # Coingecko simple price API (AUD)
         url = 'https://api.coingecko.com/api/v3/simple/price?ids=kaspa&vs_currencies=aud'
-        r = requests.get(url, timeout=5)
-        r.raise_for_status()
-        data = r.json()
-        price = float(data.get('kaspa', {}).get('aud'))
-        if price > 0:
+        headers = {'If-None-Match': _rate_etag} if _rate_etag else {}
+        r = _rate_session.get(url, timeout=5, headers=headers)
+        if r.status_code == 304:
+            # Unchanged since our ETag: keep the price, refresh the timestamp
+            if _rate_aud_per_kas is None:
+                _rate_etag = None  # nothing to reuse; force a full fetch next time
+                return False
+            with _rate_lock:
+                _rate_updated = datetime.now(timezone.utc)
+        else:
+            r.raise_for_status()
+            data = r.json()
+            price = float(data.get('kaspa', {}).get('aud'))
+            if not price > 0:
+                return False
             with _rate_lock:
                 _rate_aud_per_kas = price
                 _rate_updated = datetime.now(timezone.utc)
+                _rate_etag = r.headers.get('ETag')
     except Exception as e:
         # Keep last known
-        print('⚠️ Rate fetch failed:', e)
+        logger.warning("⚠️ Rate fetch failed: %s", e)
+        return False
+    # The rate is applied; a cache write failure must not look like a failed fetch
+    try:
+        _save_json(RATE_CACHE_PATH, {
+            'rate': _rate_aud_per_kas,
+            'etag': _rate_etag,
+            'updated_at': _rate_updated.isoformat(),
+        })
+    except OSError as e:
+        logger.warning("⚠️ Rate cache not saved: %s", e)
+    return True
+
+RATE_INTERVAL = 600       # every 10 minutes
+RATE_MAX_BACKOFF = 3600
+_rate_stop = threading.Event()
+atexit.register(_rate_stop.set)
 
 def rate_updater_thread():
+    delay = RATE_INTERVAL
     while True:
-        fetch_rate_once()
-        # every 10 minutes
-        time.sleep(600)
+        if fetch_rate_once():
+            delay = RATE_INTERVAL
+        else:
+            # back off on repeated failures so a blip doesn't become a 429 burst
+            delay = min(delay * 2, RATE_MAX_BACKOFF)
+        # +/-10% jitter; wait() returns True as soon as shutdown is requested
+        if _rate_stop.wait(delay * random.uniform(0.9, 1.1)):
+            return
 
 def get_rate():
-    with _rate_lock:
-        return _rate_aud_per_kas
+    return _rate_aud_per_kas  # lock-free, see _rate_lock
 
 if not _file_settings.get("address"):
     _save_settings({"address": config["address"]})
 
 
-_transport_cache = {"pn532": None, "acr": None}
+# "<kind>_shortcuts" holds callables resolved once when the transport is
+# built, so the per-write path makes no hasattr/getattr probes.
+_transport_cache = {
+    "pn532": None, "acr": None,
+    "pn532_shortcuts": None, "acr_shortcuts": None,
+    "pn532_writer": None, "acr_writer": None,  # Ntag21xWriter bound to the transport
+}
 _transport_lock = threading.Lock()
 
-status_lock = threading.Lock() 
-
-status = {
-    "running": False,
-    "ok": None,         # None until we have a result; True/False afterwards
-    "message": "",
-    "wrote_uri": "",
-    "uid": None,         
-    "records": [],      
-    "phase": "idle",   # idle | writing | verifying
-    "completed_at": None,
-}
+# Status is an immutable snapshot: writers publish a new tuple (a single
+# reference store, atomic under the GIL) and readers just load it, so the
+# polling/SSE read path takes no lock. `running` lives in an Event.
+Status = namedtuple("Status", "ok message wrote_uri uid records phase completed_at")
+
+status_snapshot = Status(
+    ok=None,            # None until we have a result; True/False afterwards
+    message="",
+    wrote_uri="",
+    uid=None,
+    records=(),
+    phase="idle",       # idle | writing | verifying
+    completed_at=None,
+)
+_running_evt = threading.Event()
+status_lock = threading.Lock()  # serializes writers only
 
 def _set_phase(phase: str):
+    global status_snapshot
     with status_lock:
-        status["phase"] = phase
+        status_snapshot = status_snapshot._replace(phase=phase)
     _broadcast_status()
 
 # --- SSE support ---
-import queue
-
-_sse_lock = threading.Lock()
-_sse_clients = []  # list[queue.Queue[str]]
 
-def _status_context():
-    with status_lock:
-        ctx = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-        }
+# One versioned slot instead of a queue per client: the broadcaster stores
+# the latest frame, bumps the revision and wakes every stream; a slow client
+# just skips intermediate frames and always catches up to the newest.
+_status_cv = threading.Condition()
+_status_rev = 0
+_status_frame = ""
+
+def _status_context(completed_at: bool = False):
+    # One whole-snapshot copy; no lock needed since the snapshot is immutable
+    ctx = status_snapshot._asdict()
+    if not completed_at:
+        del ctx["completed_at"]
+    ctx["running"] = _running_evt.is_set()
     return ctx
 
+def _status_ctx_split():
+    """(ctx without "message", status message) -- "message" is the merchant's form field in templates."""
+    ctx = _status_context()
+    return ctx, ctx.pop("message", "")
+
+def _alert_html(alert_class, icon, inner):
+    return (
+        f'<div class="alert {alert_class} d-flex align-items-center" role="alert">'
+        f'<i class="{icon} me-2"></i><div>{inner}</div></div>'
+    )
+
+# The fallback's fixed states, rendered once
+_HTML_VERIFYING = _alert_html('alert-info', 'bi bi-shield-check', 'Verifying…')
+_HTML_WRITING = _alert_html('alert-primary', 'bi bi-pencil-square', 'Writing…')
+_HTML_WAITING = _alert_html('alert-warning', 'bi bi-hourglass-split', 'Waiting for tag… writer is active.')
+_HTML_IDLE = '<p class="text-muted mb-0">Idle.</p>'
+
 def _status_html_fallback(ctx, verify):
-    running = ctx.get("running")
     ok = ctx.get("ok")
-    phase = ctx.get("phase")
-    wrote_uri = ctx.get("wrote_uri") or ""
-    uid = ctx.get("uid")
-    records = ctx.get("records") or []
-    status_message = ctx.get("message") or ""
-
-    def wrap(alert_class, icon, inner):
-        return (
-            f'<div class="alert {alert_class} d-flex align-items-center" role="alert">'
-            f'<i class="{icon} me-2"></i><div>{inner}</div></div>'
-        )
 
-    if running:
+    if ctx.get("running"):
+        phase = ctx.get("phase")
         if verify and phase == 'verifying':
-            return wrap('alert-info', 'bi bi-shield-check', 'Verifying…')
+            return _HTML_VERIFYING
         if phase == 'writing':
-            return wrap('alert-primary', 'bi bi-pencil-square', 'Writing…')
-        return wrap('alert-warning', 'bi bi-hourglass-split', 'Waiting for tag… writer is active.')
+            return _HTML_WRITING
+        return _HTML_WAITING
 
     if ok is not None:
         if ok:
+            wrote_uri = ctx.get("wrote_uri") or ""
+            uid = ctx.get("uid")
+            records = ctx.get("records") or []
             prefix = 'Wrote and verified:' if verify else 'Data was sent to the card.<br/>Wrote:'
-            html = wrap('alert-success', 'bi bi-check-circle', f'{prefix} <code class="text-break">{wrote_uri}</code>')
+            html = _alert_html('alert-success', 'bi bi-check-circle', f'{prefix} <code class="text-break">{wrote_uri}</code>')
             if uid:
                 html += f'<p class="mb-1">Tag UID: <code>{uid}</code></p>'
             if verify and records:
                 items = ''.join(f'<li>{r}</li>' for r in records)
                 html += f'<p class="mb-1">Decoded records:</p><ul class="small">{items}</ul>'
             return html
-        return wrap('alert-danger', 'bi bi-x-circle', f'Write failed: {status_message}')
+        return _alert_html('alert-danger', 'bi bi-x-circle', f'Write failed: {ctx.get("message") or ""}')
 
-    return '<p class="text-muted mb-0">Idle.</p>'
+    return _HTML_IDLE
 
-def _render_status_html(ctx=None):
-    if ctx is None:
-        ctx = _status_context()
-    status_message = ctx.get("message", "")
+_STATUS_KEYS = ("running", "ok", "message", "wrote_uri", "uid", "records", "phase")
+
+@lru_cache(maxsize=32)
+def _render_status_html_cached(key: tuple, verify: bool) -> str:
+    ctx = dict(zip(_STATUS_KEYS, key))
     try:
-        with app.app_context():
-            return render_template(
-                "_status.html",
-                verify=config.get("verify", False),
-                status_message=status_message,
-                **ctx,
-            )
+        if _STATUS_TMPL is None:
+            raise LookupError("_status.html not loaded")
+        return _STATUS_TMPL.render(
+            verify=verify,
+            status_message=ctx["message"],
+            **ctx,
+        )
     except Exception as e:
         # Fallback if template is missing on target device
-        print("⚠️ Using inline status fallback (", e, ")")
-        return _status_html_fallback(ctx, config.get("verify", False))
+        logger.warning("⚠️ Using inline status fallback (%s)", e)
+        return _status_html_fallback(ctx, verify)
+
+def _status_html_key():
+    """(status key, verify): identifies one rendered panel; records is a tuple in the snapshot."""
+    snap = status_snapshot
+    key = (_running_evt.is_set(),) + tuple(getattr(snap, k) for k in _STATUS_KEYS[1:])
+    return key, config.get("verify", False)
+
+def _status_event() -> str:
+    """The current status as one SSE frame; JSON has no raw newlines, so one data: line."""
+    payload = _status_context()
+    payload["verify"] = config.get("verify", False)
+    data = orjson.dumps(payload).decode() if orjson is not None else json.dumps(payload)
+    return f"event: status\ndata: {data}\n\n"
 
 def _broadcast_status():
-    # Render once and fan out; never break request flow if template missing
+    # Encode once and fan out; the pages render the JSON themselves
     try:
-        html = _render_status_html()
+        frame = _status_event()
     except Exception as e:
-        print("⚠️ SSE render failed:", e)
-        html = None
-    with _sse_lock:
-        dead = []
-        if html is not None:
-            for q in _sse_clients:
-                try:
-                    q.put_nowait(html)
-                except Exception:
-                    dead.append(q)
-        for q in dead:
-            try:
-                _sse_clients.remove(q)
-            except ValueError:
-                pass
+        logger.warning("⚠️ SSE encode failed: %s", e)
+        return
+    global _status_rev, _status_frame
+    with _status_cv:
+        _status_frame = frame
+        _status_rev += 1
+        _status_cv.notify_all()
+
+_pn532_booted = False
+
+def pn532_boot():
+    """
+    One-shot power-up: release reset, let the chip boot and SAM-configure it.
+    The chip then stays up across writes (see pn532_disable / pn532_hard_reset).
+    """
+    global _pn532_booted
+    _rst_pin.value = True
+    if _transport_cache.get("pn532") is None:
+        time.sleep(0.1)  # boot; the driver handshakes right away in its constructor
+        get_transport("pn532")  # constructor runs SAM_configuration
+    else:
+        sc = _transport_cache["pn532_shortcuts"]
+        _pn532_wait_ready(sc)
+        if sc.sam:
+            sc.sam()
+    _pn532_booted = True
+
+def _pn532_wait_ready(sc, tries: int = 20):
+    """
+    Poll GetFirmwareVersion (0x02) until the chip answers instead of sleeping
+    a fixed 100ms after reset. Falls back to the plain sleep without call_fn.
+    """
+    if not sc.call_fn:
+        time.sleep(0.1)
+        return
+    for _ in range(tries):
+        try:
+            if sc.call_fn(0x02, response_length=4, timeout=0.01):
+                return
+        except Exception:
+            pass  # not up yet (NACK / garbage frame while booting)
+        time.sleep(0.005)
 
 def pn532_enable():
     _ready_led.value = False
-    _rst_pin.value = True
-    time.sleep(0.1)  # boot
-    # ensure transport exists (or reuse)
-    t = _transport_cache.get("pn532") or get_transport("pn532")
-    # clear any stale selection so we re-select next
-    if hasattr(t, "_uid"):
+    if not _pn532_booted:
+        pn532_boot()
+    # The chip stays up between writes: just bring the field back and
+    # clear the stale selection so we re-select next
+    pn532_rf_field(True)
+    t = _transport_cache.get("pn532")
+    if t is not None:
         t._uid = None
-    # re-configure (cheap)
-    if hasattr(t, "pn") and hasattr(t.pn, "SAM_configuration"):
-        try:
-            t.pn.SAM_configuration()
-        except Exception as e:
-            print("⚠️ SAM_configuration after enable failed:", e)
 
 def pn532_rf_field(on: bool):
     """
     Best-effort RF field toggle via PN532 RFConfiguration (0x32, item=0x01).
     Safe to call even if unsupported; will just print a warning or no-op.
     """
-    t = _transport_cache.get("pn532")
-    if not t or not hasattr(t, "pn"):
-        return
-    cf = getattr(t.pn, "_call_function", None)  # private in Adafruit lib
-    if callable(cf):
+    sc = _transport_cache.get("pn532_shortcuts")
+    cf = sc and sc.call_fn
+    if cf:
         try:
             # 0x32 = RFConfiguration, params: [0x01 (RF Field), 0x00=OFF / 0x01=ON]
-            cf(0x32, bytes([0x01, 0x01 if on else 0x00]), response_length=0, timeout=1)
+            cf(0x32, params=bytes([0x01, 0x01 if on else 0x00]), response_length=0, timeout=1)
         except Exception as e:
-            print("⚠️ RFConfiguration toggle failed:", e)
+            logger.warning("⚠️ RFConfiguration toggle failed: %s", e)
 
 def pn532_disable():
-    # optional: best-effort RF off (harmless if not supported)
-    pn532_rf_field(False)
-    # hold in reset so RF is definitely off
-    _rst_pin.value = False
+    # Field off only; the chip stays out of reset and keeps its SAM config
+    if _pn532_booted:
+        pn532_rf_field(False)
     # also clear selection to be safe
     t = _transport_cache.get("pn532")
-    if t and hasattr(t, "_uid"):
+    if t is not None:
         t._uid = None
     _led_on_timed(20)
 
+def pn532_hard_reset():
+    """
+    Recovery after a driver error: pull RSTPD_N and mark the chip unbooted,
+    so the next pn532_enable() re-runs the boot (ready probe + SAM config).
+    """
+    global _pn532_booted
+    _rst_pin.value = False
+    _pn532_booted = False
+    sc = _transport_cache.get("pn532_shortcuts")
+    if sc and sc.has_low_power:
+        # after reset the SPI link needs the driver's wake-up sequence again
+        _transport_cache["pn532"].pn.low_power = True
+    t = _transport_cache.get("pn532")
+    if t is not None:
+        t._uid = None
+
 
 # (HTML moved to templates/index.html + templates/base.html)
 
+def _json_resp(obj):
+    """JSON response via orjson when available (much cheaper per poll), else stdlib json.
+
+    Datetimes come out as ISO 8601 either way (orjson encodes them natively).
+    """
+    if orjson is None:
+        return Response(json.dumps(obj, default=_json_default), mimetype="application/json")
+    return Response(orjson.dumps(obj), mimetype="application/json")
+
+def _json_default(o):
+    if isinstance(o, datetime):
+        return o.isoformat()
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+def _conditional(key, build):
+    """Weak ETag from a hash of `key`. A matching If-None-Match gets a bodiless
+    304 before `build()` runs, so unchanged polls skip the encode/render."""
+    etag = format(hash(key) & 0xFFFFFFFFFFFFFFFF, "x")
+    rsp = Response(status=304) if request.if_none_match.contains_weak(etag) else build()
+    rsp.set_etag(etag, weak=True)
+    return rsp
+
 def _admin_auth_required():
     expected = os.environ.get('KASPA_ADMIN_PASSWORD', 'admin')
     auth = request.authorization
@@ -297,24 +566,118 @@ def _admin_auth_required():
         return rsp
     return None
 
+def _bind_shortcuts(t):
+    pn = getattr(t, "pn", None)
+    return SimpleNamespace(
+        wait_for_tag=getattr(t, "wait_for_tag", None),
+        sam=getattr(pn, "SAM_configuration", None),
+        # public in recent Adafruit releases, private in older ones
+        call_fn=getattr(pn, "call_function", None) or getattr(pn, "_call_function", None),
+        has_low_power=hasattr(pn, "low_power"),
+    )
+
 def get_transport(kind: str):
     with _transport_lock:
         if kind == "pn532":
             if _transport_cache["pn532"] is None:
-                _transport_cache["pn532"] = PN532Type2Transport(
+                t = PN532Type2Transport(
                     auto_wait=not config.get("assume_present", False),
                     poll_timeout=float(config.get("poll_timeout", 0.05)),
                     reset=_rst_pin,
+                    spi_baudrate=config.get("spi_baudrate"),
                 )
+                _transport_cache["pn532_shortcuts"] = _bind_shortcuts(t)
+                _transport_cache["pn532_writer"] = Ntag21xWriter(t)
+                _transport_cache["pn532"] = t
             return _transport_cache["pn532"]
         if kind == "acr":
             if _transport_cache["acr"] is None:
-                _transport_cache["acr"] = ACR1252Type2Transport(
+                t = ACR1252Type2Transport(
                     reader_hint=config.get("reader_hint", "ACR1252")
                 )
+                _transport_cache["acr_shortcuts"] = _bind_shortcuts(t)
+                _transport_cache["acr_writer"] = Ntag21xWriter(t)
+                _transport_cache["acr"] = t
             return _transport_cache["acr"]
         raise ValueError(f"Unknown transport: {kind}")
 
+def reset_cache(kind: str):
+    """Drop the cached transport/writer for `kind`; the next get_transport() rebuilds them."""
+    with _transport_lock:
+        for key in (kind, kind + "_shortcuts", kind + "_writer"):
+            _transport_cache[key] = None
+
+# Pre-warm: build the PN532 transport and boot the chip once at startup so the
+# first write doesn't pay construction + reset + SAM config, then switch the
+# field off like between writes. ACR1252 stays lazy (rarely used).
+if config["transport"] == "pn532":
+    try:
+        pn532_boot()
+        pn532_rf_field(False)
+    except Exception as e:
+        logger.warning("⚠️ PN532 boot failed (will retry on first write): %s", e)
+
+@lru_cache(maxsize=32)
+def _build_tlv(uri: str) -> bytes:
+    """NDEF TLV for `uri`: header + record + terminator, zero-padded to whole pages."""
+    return bytes(Ntag21xWriter._uri_tlv(uri))  # same single-buffer build as write_url
+
+class _Timings:
+    """Named monotonic_ns marks for one write; only used when config["profile"] is on."""
+    __slots__ = ("marks",)
+
+    def __init__(self):
+        self.marks = {}
+
+    def mark(self, name: str):
+        self.marks[name] = time.monotonic_ns()
+
+    def _ms(self, a: str, b: str):
+        m = self.marks
+        return (m[b] - m[a]) // 1_000_000 if a in m and b in m else None
+
+    def report(self):
+        end = "verify1" if "verify1" in self.marks else "write1"
+        return {
+            "detect_wait_ms": self._ms("detect0", "detect1"),
+            "write_ms":       self._ms("write0", "write1"),
+            "verify_ms":      self._ms("verify0", "verify1"),
+            "total_ms":       self._ms("detect0", end),
+        }
+
+    @staticmethod
+    def get():
+        return _Timings() if config.get("profile", False) else _NO_TIMINGS
+
+class _NoTimings:
+    """Stand-in when profiling is off: no clock reads, no dict."""
+    __slots__ = ()
+
+    def mark(self, name: str):
+        pass
+
+    def report(self):
+        return None
+
+_NO_TIMINGS = _NoTimings()
+
+def _write_tlv(writer, tlv: bytes, cap: int, tm=_NO_TIMINGS):
+    """Burst `tlv` into the user pages (marks write0/write1 on `tm`)."""
+    first = _FIRST_USER_PAGE
+    last = _LAST_PAGE_BY_CAP[cap]  # caller checked cap against _VALID_CAPACITIES
+
+    # Timed write
+    if first + len(tlv) // 4 - 1 > last:
+        raise NDEFWriterError("Out of user pages while writing TLV.")
+    tm.mark("write0")
+    writer.write_pages_bulk(first, memoryview(tlv))  # per-page slices are views
+    tm.mark("write1")
+
+# uid_hex -> capacity of a tag whose CC already passed the checks below. The
+# CC is fixed for a given (glued) tag, so repeat writes skip the probe READ;
+# cleared on any write failure.
+_cc_cache = {}
+
 def write_with_ntag_writer(uri: str, transport: str):
     """
     Fast path with a 1-shot quick select so PN532 binds to the tag:
@@ -323,83 +686,71 @@ def write_with_ntag_writer(uri: str, transport: str):
       - write TLV
       - optional verify (disabled in your config)
     """
-    t0 = time.perf_counter()
+    tm = _Timings.get()  # no-op unless config["profile"]
+    tm.mark("detect0")
 
     # Build/reuse transport & writer
-    t_detect0 = time.perf_counter()
     tport = get_transport(transport)
-    writer = Ntag21xWriter(tport)
+    writer = _transport_cache[transport + "_writer"]
+    sc = _transport_cache[transport + "_shortcuts"]
 
     # Always do a tiny select; poll_timeout is small (e.g., 0.05s)
     try:
-        if hasattr(tport, "wait_for_tag"):
-            tport.wait_for_tag(tries=1)
+        if sc.wait_for_tag:
+            sc.wait_for_tag(tries=1)
     except Exception as e:
-        print(f"⚠️ quick select failed: {e}")
+        logger.warning("⚠️ quick select failed: %s", e)
 
     uid_hex = writer.get_uid_hex()
 
-    # Use CC read as the detection/probe
-    cc, cap = writer._read_cc()
-    if cc[0] != 0xE1:
-        raise NfcError("Tag is not NDEF-enabled (CC0 != 0xE1).")
-    if cap not in (496, 504, 872, 888):
-        raise NfcError(f"Capacity {cap}B not NTAG215/216 (got {cap}).")
-    t_detect1 = time.perf_counter()
-
-    # Build TLV
-    ndef = writer._ndef_uri_bytes(uri)
-    if len(ndef) >= 0xFF:
-        tlv = bytearray(b"\x03\xff\x00\x00")
-        tlv[2] = (len(ndef) >> 8) & 0xFF
-        tlv[3] = (len(ndef) >> 0) & 0xFF
-    else:
-        tlv = bytearray([0x03, len(ndef)])
-    tlv += ndef
-    tlv += b"\xFE"
-    while len(tlv) % 4:
-        tlv += b"\x00"
+    # One reader session for CC + write + verify (ACR1252 would otherwise
+    # end the session, and cycle the field, after every command)
+    with tport.session():
+        cap = _cc_cache.get(uid_hex) if uid_hex is not None else None
+        if cap is None:
+            # Use CC read as the detection/probe
+            try:
+                cc, cap = writer._read_cc()
+            except NDEFWriterError:
+                # Quick select missed (one short poll window): one more, then retry
+                if not sc.wait_for_tag:
+                    raise
+                sc.wait_for_tag(tries=1)
+                uid_hex = writer.get_uid_hex()
+                cc, cap = writer._read_cc()
+            if cc[0] != 0xE1:
+                raise NfcError("Tag is not NDEF-enabled (CC0 != 0xE1).")
+            if cap not in _VALID_CAPACITIES:
+                raise NfcError(f"Capacity {cap}B not NTAG215/216 (got {cap}).")
+            if uid_hex is not None:
+                _cc_cache[uid_hex] = cap
+        tm.mark("detect1")
+
+        # Always write: an unlocked tag can be rewritten by any phone between
+        # sales. Normally already built by start_writer during the select/CC I/O
+        _write_tlv(writer, _build_tlv(uri), cap, tm)
+
+        # Optional verify (you have verify=False)
+        records = []
+        if config.get("verify", False):
+            try:
+                _set_phase("verifying")
+            except Exception:
+                pass
+            tm.mark("verify0")
+            records = writer._verify_with_cap(cap)  # CC already checked above
+            tm.mark("verify1")
 
-    first = 4
-    last = writer._last_user_page_from_capacity(cap)
-
-    # Timed write
-    t_write0 = time.perf_counter()
-    for off in range(0, len(tlv), 4):
-        page = first + (off // 4)
-        if page > last:
-            raise NDEFWriterError("Out of user pages while writing TLV.")
-        writer.t.write4(page, tlv[off:off+4])
-    t_write1 = time.perf_counter()
-
-    # Optional verify (you have verify=False)
-    records = []
-    t_verify_ms = None
-    if config.get("verify", False):
-        try:
-            _set_phase("verifying")
-        except Exception:
-            pass
-        tv0 = time.perf_counter()
-        records = writer.verify()
-        tv1 = time.perf_counter()
-        t_verify_ms = (tv1 - tv0) * 1000.0
-
-    times = {
-        "detect_wait_ms": (t_detect1 - t_detect0) * 1000.0,
-        "write_ms":       (t_write1   - t_write0) * 1000.0,
-        "verify_ms":      t_verify_ms,
-        "total_ms":       ((tv1 if t_verify_ms is not None else t_write1) - t0) * 1000.0,
-    }
-    return {"uid": uid_hex, "records": records, "times": times}
+    return {"uid": uid_hex, "records": records, "times": tm.report()}
 
 # --- Conversion helpers ---
-def compute_kas_amount(aud_amount_str: str):
+@lru_cache(maxsize=64)
+def compute_kas_amount(aud_amount_str: str, price):
+    """AUD string -> KAS string at `price` AUD/KAS; pass get_rate() so the cache keys on the rate."""
     try:
         aud = float(aud_amount_str)
     except Exception:
         return None
-    price = get_rate()
     if not price:
         return None
     kas = aud / price
@@ -407,122 +758,138 @@ def compute_kas_amount(aud_amount_str: str):
     s = f"{kas:.2f}"
     return s
 
+# One long-lived writer thread fed by a 1-slot queue; the running Event
+# (set in start_writer) already rejects a second write while one is queued
+# or in flight, so the slot is always free when we put.
+_write_q = queue.Queue(maxsize=1)
+
+def _run_write(uri: str, transport: str):
+    global status_snapshot
+    ok = False
+    msg = ""
+    uid = None
+    records = []
+    try:
+        pn532_enable()
+        logger.info("📝 Starting write via %s: %s", transport, uri)
+        result = write_with_ntag_writer(uri, transport)
+        uid = result.get("uid")
+        records = result.get("records", [])
+        times = result.get("times")
+        if times:  # only with config["profile"]
+            logger.info(
+                "⏱ timings (ms): detect_wait=%d, write=%d, verify=%s, total=%d",
+                times['detect_wait_ms'],
+                times['write_ms'],
+                times['verify_ms'] if times['verify_ms'] is not None else "skipped",
+                times['total_ms'],
+            )
+        ok = True
+        msg = "Done"
+        if not config.get("verify", False):
+            msg = "Data was sent to the card"
+        else:
+            msg = "Done (verified)"
+    except (NfcError, NDEFWriterError) as e:
+        ok = False
+        msg = str(e)
+    except Exception as e:
+        ok = False
+        msg = f"Unexpected error: {e}"
+        if transport == "acr":
+            # PC/SC errors (reader unplugged, stale handle) need a fresh
+            # connection; the PN532 keeps its SPI/GPIO claims instead.
+            reset_cache("acr")
+        else:
+            pn532_hard_reset()
+    finally:
+        if not ok:
+            _cc_cache.clear()
+        pn532_disable()
+        with status_lock:
+            status_snapshot = status_snapshot._replace(
+                ok=ok,
+                message=msg,
+                uid=uid,
+                records=tuple(records),
+                phase="idle",
+                completed_at=time.time(),
+            )
+            _running_evt.clear()
+        _broadcast_status()
+        logger.info("%s Write result: %s", "✅" if ok else "❌", msg)
+
+def _writer_loop():
+    while True:
+        uri, transport = _write_q.get()
+        _run_write(uri, transport)
+
+threading.Thread(target=_writer_loop, daemon=True).start()
+
 def start_writer(uri: str, transport: str):
+    global status_snapshot
     with status_lock:
-        if status["running"]:
+        if _running_evt.is_set():
             return
-        status.update({
-            "running": True,
-            "ok": None,
-            "message": "",
-            "wrote_uri": uri,
-            "uid": None,
-            "records": [],
-            "phase": "writing",
-            "completed_at": None,
-        })
+        status_snapshot = Status(
+            ok=None,
+            message="",
+            wrote_uri=uri,
+            uid=None,
+            records=(),
+            phase="writing",
+            completed_at=None,
+        )
+        _running_evt.set()
     _broadcast_status()
+    _write_q.put_nowait((uri, transport))
+    # Encode on this (request) thread while the writer is busy with
+    # enable/select/CC over SPI, which releases the GIL; the writer then
+    # gets an lru hit. A race just means both build the same bytes.
+    _build_tlv(uri)
 
-    def _task():
-        ok = False
-        msg = ""
-        uid = None
-        records = []
-        try:
-            pn532_enable()
-            print(f"📝 Starting write via {transport}: {uri}")
-            result = write_with_ntag_writer(uri, transport)
-            uid = result.get("uid")
-            records = result.get("records", [])
-            times = result.get("times", {})
-            print(
-                "⏱ timings (ms): "
-                f"detect_wait={times.get('detect_wait_ms',0):.0f}, "
-                f"write={times.get('write_ms',0):.0f}, "
-                + (f"verify={times['verify_ms']:.0f}, " if times.get('verify_ms') is not None else "verify=skipped, ")
-                + f"total={times.get('total_ms',0):.0f}"
-            )
-            ok = True
-            msg = "Done"
-            if not config.get("verify", False):
-                msg = "Data was sent to the card"
-            else:
-                msg = "Done (verified)"
-        except (NfcError, NDEFWriterError) as e:
-            ok = False
-            msg = str(e)
-        except Exception as e:
-            ok = False
-            msg = f"Unexpected error: {e}"
-        finally:
-            pn532_disable()
-            with status_lock:
-                status.update({
-                    "running": False,
-                    "ok": ok,
-                    "message": msg,
-                    "uid": uid,
-                    "records": records,
-                    "phase": "idle",
-                    "completed_at": time.time(),
-                })
-            _broadcast_status()
-            print(("✅" if ok else "❌"), f"Write result: {msg}")
-
-    threading.Thread(target=_task, daemon=True).start()
 
+# Hash of the last POSTed (address, amount, message); an identical POST
+# while that write is still running is a double-submit and is dropped early.
+_last_post_hash = None
 
 @app.route("/", methods=["GET", "POST"])
 def index():
+    global _last_post_hash
     if request.method == "POST":
+        amount  = request.form.get("amount",  config["amount"]).strip()
+        message = request.form.get("message", config["message"]).strip()
+        h = hash((config["address"], amount, message))
+        if h == _last_post_hash and _running_evt.is_set():
+            return redirect(url_for('index'))
+        _last_post_hash = h
+
         # Address is managed via admin page and persisted to file
-        config["amount"]    = request.form.get("amount",  config["amount"]).strip()
-        config["message"]   = request.form.get("message", config["message"]).strip()
-
-        # Build the final write URI in the required format:
-        # kaspa:... ?amount=KAS_AMOUNT&label=<message>&message=<message>
-        base = config["address"]
-        sep = '&' if '?' in base else '?'
-        kas_amount = compute_kas_amount(config["amount"]) or config["amount"]
-        uri = (
-            f'{base}{sep}'
-            f'amount={quote_plus(str(kas_amount))}'
-            f'&label={quote_plus(config["message"])}'
-            f'&message={quote_plus(config["message"])}'
-        )
+        config["amount"]    = amount
+        config["message"]   = message
+
+        # Build the final write URI in the required format
+        kas_amount = compute_kas_amount(config["amount"], get_rate()) or config["amount"]
+        uri = _build_uri(config["address"], str(kas_amount), config["message"])
         start_writer(uri, config["transport"])
         # Redirect immediately; client toasts will show Submitted then Success/Failure
         return redirect(url_for('index'))
 
     # Preview should match exactly what we write:
-    base = config["address"]
-    sep = '&' if '?' in base else '?'
-    kas_amount_preview = compute_kas_amount(config["amount"])  # None until rate available
-    full_url = (
-        f'{base}{sep}'
-        f'amount={quote_plus(str(kas_amount_preview)) if kas_amount_preview is not None else "..."}'
-        f'&label={quote_plus(config["message"])}'
-        f'&message={quote_plus(config["message"])}'
+    kas_amount_preview = compute_kas_amount(config["amount"], get_rate())  # None until rate available
+    full_url = _build_uri(
+        config["address"],
+        str(kas_amount_preview) if kas_amount_preview is not None else "...",
+        config["message"],
     )
 
-    with status_lock:
-        ctx = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],   # status text (ok/fail details)
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-        }
-
     # Avoid name collision with the merchant's "message"
-    status_message = ctx.pop("message", "")
+    ctx, status_message = _status_ctx_split()
 
     # Capture rate + timestamp for display
-    with _rate_lock:
-        rate_val = _rate_aud_per_kas
-        rate_updated = _rate_updated.isoformat() if _rate_updated else None
+    rate_val = _rate_aud_per_kas
+    updated = _rate_updated
+    rate_updated = updated.isoformat() if updated else None
     rate_str = (f"{rate_val:.6f}" if isinstance(rate_val, (int, float)) and rate_val is not None else None)
 
     # Simple formatted time for main page (local time)
@@ -552,64 +919,26 @@ def index():
 @app.route("/status_panel")
 def status_panel():
     """Return just the status panel body as an HTML snippet for polling."""
-    with status_lock:
-        ctx = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-        }
-    status_message = ctx.pop("message", "")
-    try:
-        html = render_template(
-                "_status.html",
-                verify=config.get("verify", False),
-                status_message=status_message,
-                **ctx,
-            )
-    except Exception as e:
-        print("⚠️ /status_panel using inline fallback (", e, ")")
-        html = _status_html_fallback(ctx, config.get("verify", False))
-    rsp = make_response(html)
+    key = _status_html_key()
+    # Rendered once per status change; polls in between are a cache hit or a 304
+    rsp = _conditional(key, lambda: make_response(_render_status_html_cached(*key)))
     rsp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
     rsp.headers["Pragma"] = "no-cache"
     return rsp
 
 @app.route("/status.json")
 def status_json():
-    with status_lock:
-        payload = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-            "verify":   config.get("verify", False),
-            "completed_at": status["completed_at"],
-        }
-    rsp = make_response(jsonify(payload))
+    payload = _status_context(completed_at=True)
+    payload["verify"] = config.get("verify", False)
+    # records is a tuple in the snapshot, so the items are hashable
+    rsp = _conditional(tuple(payload.items()), lambda: _json_resp(payload))
     rsp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
     rsp.headers["Pragma"] = "no-cache"
     return rsp
 
 @app.route("/status_simple")
 def status_simple():
-    with status_lock:
-        ctx = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-        }
-    status_message = ctx.pop("message", "")
+    ctx, status_message = _status_ctx_split()
     try:
         html = render_template(
             "_status_simple.html",
@@ -618,7 +947,7 @@ def status_simple():
             **ctx,
         )
     except Exception as e:
-        print("⚠️ /status_simple inline fallback (", e, ")")
+        logger.warning("⚠️ /status_simple inline fallback (%s)", e)
         html = _status_html_fallback(ctx, config.get("verify", False))
     rsp = make_response(html)
     rsp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
@@ -627,51 +956,43 @@ def status_simple():
 
 @app.route('/rate.json')
 def rate_json():
-    with _rate_lock:
-        price = _rate_aud_per_kas
-        updated = _rate_updated.isoformat() if _rate_updated else None
-    return jsonify({'aud_per_kas': price, 'updated_at': updated})
+    price = _rate_aud_per_kas
+    updated = _rate_updated
+    return _conditional(
+        (price, updated),
+        lambda: _json_resp({'aud_per_kas': price, 'updated_at': updated}),
+    )
 
 @app.route('/clear_status', methods=['POST'])
 def clear_status():
+    global status_snapshot
     with status_lock:
-        if not status["running"]:
-            status.update({
-                "ok": None,
-                "message": "",
-                "completed_at": None,
-            })
+        if not _running_evt.is_set():
+            status_snapshot = status_snapshot._replace(
+                ok=None,
+                message="",
+                completed_at=None,
+            )
     return ('', 204)
 
 @app.route("/events")
 def sse_events():
-    q = queue.Queue(maxsize=10)
-    with _sse_lock:
-        _sse_clients.append(q)
-
     def gen():
+        with _status_cv:
+            last_rev = _status_rev
         # Send initial snapshot
         try:
-            init_html = _render_status_html()
-            init_html = init_html.replace("\n", "\ndata: ")
-            yield "data: " + init_html + "\n\n"
+            yield _status_event()
         except Exception:
             pass
-        try:
-            while True:
-                try:
-                    html = q.get(timeout=15)
-                    html = html.replace("\n", "\ndata: ")
-                    yield "data: " + html + "\n\n"
-                except queue.Empty:
-                    # heartbeat to keep connection alive
-                    yield ": keep-alive\n\n"
-        finally:
-            with _sse_lock:
-                try:
-                    _sse_clients.remove(q)
-                except ValueError:
-                    pass
+        while True:
+            with _status_cv:
+                if _status_cv.wait_for(lambda: _status_rev != last_rev, timeout=15):
+                    frame, last_rev = _status_frame, _status_rev
+                else:
+                    frame = None
+            # heartbeat to keep connection alive
+            yield frame if frame is not None else ": keep-alive\n\n"
 
     rsp = Response(gen(), mimetype='text/event-stream')
     rsp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
@@ -695,27 +1016,13 @@ def admin_page():
         return redirect(url_for('admin_page'))
 
     # Build a preview based on current config and conversion
-    base = config["address"]
-    sep = '&' if '?' in base else '?'
-    kas_amount_preview = compute_kas_amount(config["amount"])  # None until rate available
-    full_url = (
-        f'{base}{sep}'
-        f'amount={quote_plus(str(kas_amount_preview)) if kas_amount_preview is not None else "..."}'
-        f'&label={quote_plus(config["message"])}'
-        f'&message={quote_plus(config["message"])}'
+    kas_amount_preview = compute_kas_amount(config["amount"], get_rate())  # None until rate available
+    full_url = _build_uri(
+        config["address"],
+        str(kas_amount_preview) if kas_amount_preview is not None else "...",
+        config["message"],
     )
-    with status_lock:
-        ctx = {
-            "running":  status["running"],
-            "ok":       status["ok"],
-            "message":  status["message"],
-            "wrote_uri":status["wrote_uri"],
-            "uid":      status["uid"],
-            "records":  status["records"],
-            "phase":    status["phase"],
-        }
-    status_message = ctx.pop("message", "")
-    status_html = _render_status_html({**ctx, "message": status_message})
+    ctx, status_message = _status_ctx_split()
     return render_template(
         'admin.html',
         page_title='Kaspa Admin',
@@ -723,11 +1030,30 @@ def admin_page():
         transport=config['transport'],
         full_url=full_url,
         verify=config.get('verify', False),
-        status_message=status_message,
-        status_html=status_html,
+        status_message=status_message,    # admin.html includes _status.html
         **ctx,
     )
-if __name__ == "__main__":
-    # Start periodic rate updater (tolerates missing requests module)
+_background_started = False
+
+def start_background():
+    """Start the periodic rate updater once (tolerates missing requests module)."""
+    global _background_started
+    if _background_started:
+        return
+    _background_started = True
     threading.Thread(target=rate_updater_thread, daemon=True).start()
-    app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False)
+
+if __name__ == "__main__":
+    start_background()
+    try:
+        from waitress import serve
+    except Exception:
+        serve = None
+    if serve is not None and not os.environ.get("KASPA_DEV_SERVER"):
+        # Single process (GPIO pins and the transport cache are process-global);
+        # threads>1 so status polls / SSE don't queue behind the write POST.
+        serve(app, host="0.0.0.0", port=5000, threads=8)
+    else:
+        # Dev server (KASPA_DEV_SERVER=1, or waitress missing). threaded=True so
+        # status polls / SSE are served while the writer thread owns the tag.
+        app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False, threaded=True)
@@ -10,8 +10,11 @@
 # Usage (see test_ntag_writer.py for a runnable example)
 
 from __future__ import annotations
+import inspect
+import struct
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from contextlib import contextmanager
+from typing import List, Optional, Tuple, Union
 
 # -------- Exceptions --------
 
@@ -21,6 +24,51 @@ class TagNotSupported(NDEFWriterError): ...
 class CapacityError(NDEFWriterError): ...
 class VerificationError(NDEFWriterError): ...
 
+# -------- NDEF URI prefixes (NFC Forum URI RTD, identifier code = index) --------
+
+_NDEF_URI_PREFIXES: Tuple[str, ...] = (
+    "","http://www.","https://www.","http://","https://","tel:","mailto:",
+    "ftp://anonymous:anonymous@","ftp://ftp.","ftps://","sftp://","smb://",
+    "nfs://","ftp://","dav://","news:","telnet://","imap:","rtsp://","urn:",
+    "pop:","sip:","sips:","tftp:","btspp://","btl2cap://","btgoep://","tcpobex://",
+    "irdaobex://","file://","urn:epc:id:","urn:epc:tag:","urn:epc:pat:","urn:epc:raw:",
+    "urn:epc:","urn:nfc:",
+)
+
+def _uri_scheme_key(s: str) -> str:
+    """Everything up to and including the first ':' ('' if none): 'https://www.x' -> 'https:'."""
+    return s[:s.find(":") + 1]
+
+# scheme key -> ((prefix, code), ...) longest first, so the first startswith()
+# hit is the longest match, e.g. "https:" -> (("https://www.", 2), ("https://", 4))
+_PREFIX_BY_SCHEME = {}
+for _code, _p in enumerate(_NDEF_URI_PREFIXES):
+    if _p:
+        _PREFIX_BY_SCHEME.setdefault(_uri_scheme_key(_p), []).append((_p, _code))
+_PREFIX_BY_SCHEME = {k: tuple(sorted(v, key=lambda e: -len(e[0]))) for k, v in _PREFIX_BY_SCHEME.items()}
+del _code, _p
+
+def _uri_prefix(uri: str) -> Tuple[int, int]:
+    """(identifier code, prefix length) of the longest abbreviating prefix; (0, 0) if none."""
+    for p, code in _PREFIX_BY_SCHEME.get(_uri_scheme_key(uri), ()):
+        if uri.startswith(p):
+            return code, len(p)
+    return 0, 0
+
+# NDEF record header: flags/TNF byte + type length; non-SR payload length is 4 bytes
+_NDEF_HDR = struct.Struct(">BB")
+_NDEF_LEN32 = struct.Struct(">I")
+# TLV 3-byte length form: 0xFF + 2-byte big-endian length
+_TLV_LEN16 = struct.Struct(">H")
+
+# -------- Capacities --------
+
+# CC size field * 8 for NTAG215 (496/504) and NTAG216 (872/888)
+_VALID_CAPACITIES = frozenset((496, 504, 872, 888))
+# NTAG21x user area starts at page 4
+_FIRST_USER_PAGE = 4
+_LAST_PAGE_BY_CAP = {c: _FIRST_USER_PAGE + c // 4 - 1 for c in _VALID_CAPACITIES}
+
 
 # ============================================================
 # ACR1252 Transport (PC/SC via pyscard)
@@ -46,9 +94,45 @@ class Type2Transport(ABC):
         """WRITE (0xA2): write exactly 4 bytes to page."""
         raise NotImplementedError
 
+    def write_pages(self, first_page: int, data: bytes) -> None:
+        """
+        Write consecutive pages from a 4-byte aligned buffer.
+        NTAG215/216 have no multi-page WRITE (FAST_WRITE is NTAG I2C SRAM only),
+        so the default is one WRITE per page; transports override this to
+        drop their per-command overhead for the whole burst.
+        """
+        if len(data) % 4:
+            raise ValueError("write_pages needs a multiple of 4 bytes")
+        for off in range(0, len(data), 4):
+            self.write4(first_page + off // 4, data[off:off+4])
+
+    # FAST_READ chunk: 60 pages = 240 bytes keeps every reply inside one
+    # PN532 frame; on the ACR1252 it comes back as a long-form 0x97 DO
+    # (97 81 F0 ...), which _transparent_exchange decodes
+    FAST_READ_MAX_PAGES = 60
+
+    def fast_read(self, start_page: int, end_page: int) -> bytes:
+        """
+        Return pages start_page..end_page (inclusive). NTAG21x FAST_READ (0x3A)
+        does this in one command; the default falls back to READ (0x30) x4.
+        """
+        out = bytearray()
+        for p in range(start_page, end_page + 1, 4):
+            out += self.read16(p)
+        return bytes(out[:(end_page - start_page + 1) * 4])
+
     def get_uid(self) -> Optional[bytes]:
         """Optional: return UID bytes if the transport can provide it."""
         return None
+
+    @contextmanager
+    def session(self):
+        """
+        Group several commands into one reader session (e.g. CC read + TLV
+        write + verify). No-op by default; transports with per-command
+        session teardown override it.
+        """
+        yield self
 # ===========================================================
 class ACR1252Type2Transport(Type2Transport):
     """
@@ -85,28 +169,36 @@ class ACR1252Type2Transport(Type2Transport):
 
         self._conn = self._reader.createConnection()
         self._conn.connect()
+        self._in_session = 0  # >0 inside session(): defer _end_session to its exit
 
     def _transparent_exchange(self, cmd_bytes: bytes) -> bytes:
         """
         FF C2 00 01 <Lc> [5F 46 ...] [95 <len cmd> <cmd...>] -> parse 0x97 'ICC response' DO
         """
-        from smartcard.util import toHexString
         DO_params = self._ACS_DO_PARAMS
         DO_cmd    = bytes([0x95, len(cmd_bytes)]) + bytes(cmd_bytes)
         body = DO_params + DO_cmd
         apdu = [0xFF, 0xC2, 0x00, 0x01, len(body)] + list(body)
         resp, sw1, sw2 = self._conn.transmit(apdu)
         if (sw1, sw2) != (0x90, 0x00):
-            raise NfcError(f"Transparent Exchange failed: SW={hex(sw1)} {hex(sw2)} Resp={toHexString(resp)}")
-        # Parse TLV-like DOs to get 0x97
-        b = bytes(resp); i = 0; card = b""
-        while i + 2 <= len(b):
-            tag = b[i]; i += 1
-            ln  = b[i]; i += 1
-            val = b[i:i+ln]; i += ln
-            if tag == 0x97:
-                card = bytes(val)
-        return card
+            raise NfcError(f"Transparent Exchange failed: SW={hex(sw1)} {hex(sw2)} Resp={bytes(resp).hex(' ').upper()}")
+        # Walk the TLV-like DOs by index (no per-DO slices) and cut only the
+        # 0x97 'ICC response'. A raw find(0x97) could hit a byte inside an
+        # earlier DO's value (e.g. the C0 status), so the walk stays.
+        # Lengths are BER: one byte up to 0x7F, else 0x81 LL / 0x82 LL LL.
+        b = bytes(resp); i = 0; n = len(b)
+        while i + 2 <= n:
+            ln = b[i + 1]; v = i + 2
+            if ln == 0x81:
+                if v + 1 > n: break
+                ln = b[v]; v += 1
+            elif ln == 0x82:
+                if v + 2 > n: break
+                ln = (b[v] << 8) | b[v + 1]; v += 2
+            if b[i] == 0x97:
+                return b[v:v + ln]
+            i = v + ln
+        return b""
 
     def _end_session(self):
         apdu = [0xFF, 0xC2, 0x00, 0x00, 0x02, 0x82, 0x00]
@@ -115,11 +207,27 @@ class ACR1252Type2Transport(Type2Transport):
         except Exception:
             pass
 
+    def _end_op(self):
+        # Single-shot commands tear the session down; inside session() it waits
+        if not self._in_session:
+            self._end_session()
+
+    @contextmanager
+    def session(self):
+        """Keep one transparent session (and RF field) across all commands inside."""
+        self._in_session += 1
+        try:
+            yield self
+        finally:
+            self._in_session -= 1
+            if not self._in_session:
+                self._end_session()
+
     def read16(self, first_page: int) -> bytes:
         try:
             r = self._transparent_exchange(bytes([0x30, first_page]))
         finally:
-            self._end_session()
+            self._end_op()
         if len(r) != 16:
             raise NfcError(f"ACR1252 READ returned {len(r)} bytes (expected 16)")
         return r
@@ -130,7 +238,33 @@ class ACR1252Type2Transport(Type2Transport):
         try:
             _ = self._transparent_exchange(bytes([0xA2, page]) + bytes(data4))
         finally:
-            self._end_session()
+            self._end_op()
+
+    def write_pages(self, first_page: int, data: bytes) -> None:
+        """All WRITEs in one transparent session; end it once, not per page."""
+        if len(data) % 4:
+            raise ValueError("write_pages needs a multiple of 4 bytes")
+        mv = memoryview(data)  # zero-copy page slices
+        try:
+            for off in range(0, len(mv), 4):
+                self._transparent_exchange(bytes((0xA2, first_page + off // 4)) + mv[off:off+4])
+        finally:
+            self._end_op()
+
+    def fast_read(self, start_page: int, end_page: int) -> bytes:
+        """FAST_READ (0x3A) in chunks, all in one transparent session."""
+        out = bytearray()
+        step = self.FAST_READ_MAX_PAGES
+        try:
+            for p in range(start_page, end_page + 1, step):
+                q = min(p + step - 1, end_page)
+                r = self._transparent_exchange(bytes((0x3A, p, q)))
+                if len(r) != (q - p + 1) * 4:
+                    raise NfcError(f"ACR1252 FAST_READ returned {len(r)} bytes (expected {(q - p + 1) * 4})")
+                out += r
+        finally:
+            self._end_op()
+        return bytes(out)
 
     def get_uid(self) -> Optional[bytes]:
         try:
@@ -154,7 +288,7 @@ class PN532Type2Transport(Type2Transport):
     but you can pass a pre-built PN532 object or your own I2C/SPI handles.
     """
     def __init__(self, pn=None, *, i2c=None, spi=None, cs=None, irq=None, reset=None,
-                 auto_wait=True, poll_timeout=0.5):
+                 auto_wait=True, poll_timeout=0.5, spi_baudrate: Optional[int] = None):
         try:
             import adafruit_pn532.i2c as pn532_i2c
             import adafruit_pn532.spi as pn532_spi
@@ -176,7 +310,25 @@ class PN532Type2Transport(Type2Transport):
                 rst_pin = digitalio.DigitalInOut(board.D25) if reset is None else reset
                 self.pn = pn532_spi.PN532_SPI(spi, cs_pin, reset=rst_pin, debug=False)
 
+        # Adafruit's SPIDevice re-applies .baudrate on every transaction; the
+        # PN532 is rated up to 5 MHz, the driver default is far slower.
+        if spi_baudrate and hasattr(getattr(self.pn, "_spi", None), "baudrate"):
+            self.pn._spi.baudrate = int(spi_baudrate)
+
+        # Page helpers differ by driver release; resolve them once here
+        # rather than probing with hasattr() on every page
+        self._read_block = (getattr(self.pn, "ntag2xx_read_block", None)
+                            or getattr(self.pn, "mifare_ultralight_read_page", None))
+        self._write_block = (getattr(self.pn, "ntag2xx_write_block", None)
+                             or getattr(self.pn, "mifare_ultralight_write_page", None))
+        if self._read_block is None or self._write_block is None:
+            raise NfcError(
+                "PN532 driver has neither ntag2xx_read/write_block nor mifare_ultralight_read/write_page. "
+                "Upgrade the library: pip install --upgrade adafruit-circuitpython-pn532"
+            )
+
         self.pn.SAM_configuration()
+        self._call_function = self._raw_call_function(self.pn)
         self._poll_timeout = poll_timeout
         self._uid = None
         if auto_wait:
@@ -192,60 +344,94 @@ class PN532Type2Transport(Type2Transport):
 
     def read16(self, first_page: int) -> bytes:
         """
-        Read 16 bytes starting at 'first_page' using PN532 helpers.
-        Tries ntag2xx_read_block (preferred), then mifare_ultralight_read_page.
+        Read 16 bytes starting at 'first_page' using the PN532 page helper
+        bound in __init__ (ntag2xx_read_block or mifare_ultralight_read_page).
         """
-        # Preferred in recent adafruit-circuitpython-pn532
-        if hasattr(self.pn, "ntag2xx_read_block"):
-            out = bytearray()
-            for p in range(first_page, first_page + 4):
-                r = self.pn.ntag2xx_read_block(p)
-                if r is None or len(r) != 4:
-                    raise TagNotSupported("ntag2xx_read_block failed — likely not a Type-2/NTAG tag.")
-                out += r
-            return bytes(out)
-
-        # Older / alternate API name
-        if hasattr(self.pn, "mifare_ultralight_read_page"):
-            out = bytearray()
-            for p in range(first_page, first_page + 4):
-                r = self.pn.mifare_ultralight_read_page(p)
-                if r is None or len(r) != 4:
-                    raise TagNotSupported("Ultralight read failed — likely not a Type-2/NTAG tag.")
-                out += r
-            return bytes(out)
-
-        # No supported helpers found
-        raise NfcError(
-            "PN532 driver has neither ntag2xx_read_block nor mifare_ultralight_read_page. "
-            "Upgrade the library: pip install --upgrade adafruit-circuitpython-pn532"
-        )
+        read_block = self._read_block
+        out = bytearray()
+        for p in range(first_page, first_page + 4):
+            r = read_block(p)
+            if r is None or len(r) != 4:
+                raise TagNotSupported("PN532 page read failed — likely not a Type-2/NTAG tag.")
+            out += r
+        return bytes(out)
 
     def write4(self, page: int, data4: bytes) -> None:
         """
-        Write 4 bytes to 'page' using PN532 helpers.
-        Tries ntag2xx_write_block, then mifare_ultralight_write_page.
+        Write 4 bytes to 'page' using the PN532 page helper bound in __init__
+        (ntag2xx_write_block or mifare_ultralight_write_page).
         """
         if len(data4) != 4:
             raise ValueError("WRITE needs exactly 4 bytes")
+        if self._write_block(page, bytes(data4)) is False:
+            raise NfcError("PN532 page write failed")
 
-        if hasattr(self.pn, "ntag2xx_write_block"):
-            ok = self.pn.ntag2xx_write_block(page, bytes(data4))
-            if ok is False:
-                raise NfcError("PN532 ntag2xx_write_block failed")
-            return
+    # keyword arguments the raw InDataExchange paths (write_pages, fast_read)
+    # pass to call_function
+    _CALL_KWARGS = frozenset(("params", "response_length", "timeout"))
 
-        if hasattr(self.pn, "mifare_ultralight_write_page"):
-            ok = self.pn.mifare_ultralight_write_page(page, bytes(data4))
-            if ok is False:
-                raise NfcError("PN532 Ultralight write failed")
-            return
+    @classmethod
+    def _raw_call_function(cls, pn):
+        """
+        The driver's call_function if its signature takes the keywords we pass,
+        else None (raw paths off; page helpers only). Settled once, so an error
+        during a live call is never mistaken for a signature mismatch.
+        """
+        # public in recent Adafruit releases, private in older ones
+        call = getattr(pn, "call_function", None) or getattr(pn, "_call_function", None)
+        if call is None:
+            return None
+        try:
+            params = inspect.signature(call).parameters
+        except (TypeError, ValueError):
+            return None
+        return call if cls._CALL_KWARGS <= params.keys() else None
 
-        raise NfcError(
-            "PN532 driver has neither ntag2xx_write_block nor mifare_ultralight_write_page. "
-            "Upgrade the library: pip install --upgrade adafruit-circuitpython-pn532"
-        )
+    # InDataExchange params: Tg=1, WRITE (0xA2), page; the 4 data bytes follow
+    _WRITE_HDR = struct.Struct(">BBB")
 
+    def write_pages(self, first_page: int, data: bytes) -> None:
+        """
+        Raw InDataExchange WRITE per page through one reusable 7-byte frame,
+        packed in place (no per-page bytes objects, no helper probing).
+        """
+        call = self._call_function
+        if call is None:
+            return super().write_pages(first_page, data)
+        if len(data) % 4:
+            raise ValueError("write_pages needs a multiple of 4 bytes")
+        mv = memoryview(data)
+        frame = bytearray(7)
+        pack = self._WRITE_HDR.pack_into
+        for off in range(0, len(mv), 4):
+            page = first_page + (off >> 2)
+            pack(frame, 0, 0x01, 0xA2, page)
+            frame[3:7] = mv[off:off+4]
+            try:
+                resp = call(0x40, params=frame, response_length=1)
+            except Exception as e:
+                raise NfcError(f"PN532 WRITE failed at page {page}: {e}") from e
+            if not resp or resp[0] != 0x00:
+                raise NfcError(f"PN532 WRITE failed at page {page}")
+
+    def fast_read(self, start_page: int, end_page: int) -> bytes:
+        """FAST_READ (0x3A) through raw InDataExchange, one command per chunk."""
+        call = self._call_function
+        if call is None:
+            return super().fast_read(start_page, end_page)
+        out = bytearray()
+        step = self.FAST_READ_MAX_PAGES
+        for p in range(start_page, end_page + 1, step):
+            q = min(p + step - 1, end_page)
+            n = (q - p + 1) * 4
+            try:
+                resp = call(0x40, params=bytes((0x01, 0x3A, p, q)), response_length=n + 1, timeout=1)
+            except Exception as e:
+                raise NfcError(f"PN532 FAST_READ failed at page {p}: {e}") from e
+            if not resp or resp[0] != 0x00 or len(resp) != n + 1:
+                raise NfcError(f"PN532 FAST_READ failed at page {p}")
+            out += resp[1:]
+        return bytes(out)
 
     def get_uid(self) -> Optional[bytes]:
         return self._uid
@@ -267,92 +453,113 @@ class Ntag21xWriter:
 
     @staticmethod
     def _pad4(b: bytes) -> bytes:
-        r = len(b) % 4
-        return b if r == 0 else b + b"\x00" * (4 - r)
+        r = -len(b) & 3  # bytes missing to the next page boundary
+        return b if r == 0 else b + b"\x00" * r
 
     @staticmethod
-    def _ndef_uri_bytes(uri: str) -> bytes:
-        prefixes = ["","http://www.","https://www.","http://","https://","tel:","mailto:",
-                    "ftp://anonymous:anonymous@","ftp://ftp.","ftps://","sftp://","smb://",
-                    "nfs://","ftp://","dav://","news:","telnet://","imap:","rtsp://","urn:",
-                    "pop:","sip:","sips:","tftp:","btspp://","btl2cap://","btgoep://","tcpobex://",
-                    "irdaobex://","file://","urn:epc:id:","urn:epc:tag:","urn:epc:pat:","urn:epc:raw:",
-                    "urn:epc:","urn:nfc:"]
-        pidx, best = 0, ""
-        for i, p in enumerate(prefixes):
-            if p and uri.startswith(p) and len(p) > len(best):
-                pidx, best = i, p
-        tail = uri[len(best):].encode("utf-8")
-        payload = bytes([pidx]) + tail
-        t = b"U"
+    def _ndef_uri_record_len(payload_len: int) -> int:
+        """Size of one URI record whose payload (prefix code + tail) is payload_len bytes."""
+        return (3 if payload_len < 256 else 6) + 1 + payload_len
+
+    @staticmethod
+    def _write_ndef_uri_into(buf: bytearray, off: int, code: int, tail: bytes) -> int:
+        """Write the URI record for (prefix code, encoded tail) at buf[off:]; returns its size."""
+        plen = len(tail) + 1
         # Use Short Record (SR) only if payload < 256; otherwise 4-byte length
-        if len(payload) < 256:
-            header = 0xD1  # MB|ME|SR + TNF=1 (well-known)
-            return bytes([header, len(t), len(payload)]) + t + payload
+        if plen < 256:
+            buf[off] = 0xD1      # MB|ME|SR + TNF=1 (well-known)
+            buf[off + 1] = 1     # type length
+            buf[off + 2] = plen
+            o = off + 3
+        else:
+            buf[off] = 0xC1      # MB|ME (no SR) + TNF=1
+            buf[off + 1] = 1
+            buf[off + 2:off + 6] = plen.to_bytes(4, "big")
+            o = off + 6
+        buf[o] = 0x55            # type "U"
+        buf[o + 1] = code
+        buf[o + 2:o + 2 + len(tail)] = tail
+        return o + 2 + len(tail) - off
+
+    @staticmethod
+    def _ndef_uri_bytes(uri: str) -> bytes:
+        code, plen = _uri_prefix(uri)
+        tail = uri[plen:].encode("utf-8")
+        buf = bytearray(Ntag21xWriter._ndef_uri_record_len(len(tail) + 1))
+        Ntag21xWriter._write_ndef_uri_into(buf, 0, code, tail)
+        return bytes(buf)
+
+    @staticmethod
+    def _uri_tlv(uri: str) -> bytearray:
+        """
+        NDEF TLV for uri (03 L <record> FE), zero-padded to whole pages, built
+        in one preallocated buffer with the record written in place.
+        """
+        code, plen = _uri_prefix(uri)
+        tail = uri[plen:].encode("utf-8")
+        nl = Ntag21xWriter._ndef_uri_record_len(len(tail) + 1)
+        hdr = 2 if nl < 0xFF else 4
+        body = hdr + nl + 1                  # TLV header + record + terminator
+        tlv = bytearray(body + (-body & 3))  # pad only AFTER the terminator
+        tlv[0] = 0x03
+        if hdr == 2:
+            tlv[1] = nl
         else:
-            header = 0xC1  # MB|ME (no SR) + TNF=1
-            plen = len(payload).to_bytes(4, "big")
-            return bytes([header, len(t)]) + plen + t + payload
+            tlv[1] = 0xFF
+            tlv[2:4] = nl.to_bytes(2, "big")
+        Ntag21xWriter._write_ndef_uri_into(tlv, hdr, code, tail)
+        tlv[hdr + nl] = 0xFE  # terminator
+        return tlv
+
+    @staticmethod
+    def _decode_uri_payload(p: Union[bytes, memoryview]) -> str:
+        """URI record payload ([prefix code][tail]) -> full URI; unknown codes get no prefix."""
+        code = p[0]
+        prefix = _NDEF_URI_PREFIXES[code] if code < len(_NDEF_URI_PREFIXES) else ""
+        return prefix + str(p[1:], "utf-8", "ignore")
 
     @staticmethod
-    def _parse_ndef_records(msg: bytes) -> List[str]:
+    def _parse_ndef_records(msg: Union[bytes, memoryview]) -> List[str]:
         out: List[str] = []
+        n = len(msg)
+        if n < 3:  # shorter than any record header
+            return out
 
         # --- Heuristic fallback: buffer starts at payload_len instead of header ---
-        # Pattern: [len][0x55 'U'][prefix][uri...]
-        if len(msg) >= 3 and msg[1] == 0x55 and msg[0] == (len(msg) - 2):
-            prefs = ["","http://www.","https://www.","http://","https://","tel:","mailto:",
-                     "ftp://anonymous:anonymous@","ftp://ftp.","ftps://","sftp://","smb://",
-                     "nfs://","ftp://","dav://","news:","telnet://","imap:","rtsp://","urn:",
-                     "pop:","sip:","sips:","tftp:","btspp://","btl2cap://","btgoep://","tcpobex://",
-                     "irdaobex://","file://","urn:epc:id:","urn:epc:tag:","urn:epc:pat:","urn:epc:raw:",
-                     "urn:epc:","urn:nfc:"]
-            plen = msg[0]
-            pfx  = msg[2]
-            uri_tail = msg[3:3+plen-1].decode(errors="ignore")
-            prefix = prefs[pfx] if pfx < len(prefs) else ""
-            out.append(f"NDEF URI: {prefix}{uri_tail}")
+        # Pattern: [len][0x55 'U'][prefix][uri...]; two byte compares, nothing
+        # else is touched unless both match
+        if msg[1] == 0x55 and msg[0] == n - 2:
+            out.append(f"NDEF URI: {Ntag21xWriter._decode_uri_payload(msg[2:])}")
             return out
 
+        mv = memoryview(msg)
         i = 0
-        while i < len(msg):
-            if i >= len(msg): break
-            hdr = msg[i]; i += 1
-            if i >= len(msg): break
-            tlen = msg[i]; i += 1
-            sr = bool(hdr & 0x10)
-            if sr:
-                if i >= len(msg): break
-                plen = msg[i]; i += 1
-            else:
-                if i + 1 >= len(msg): break
-                plen = (msg[i] << 8) | msg[i+1]; i += 2
-            il = bool(hdr & 0x08)
+        while i + 2 <= n:
+            hdr, tlen = _NDEF_HDR.unpack_from(mv, i); i += 2
+            if hdr & 0x10:  # SR: 1-byte payload length
+                if i >= n: break
+                plen = mv[i]; i += 1
+            else:           # 4-byte payload length (NDEF spec; _ndef_uri_bytes writes 4)
+                if i + 4 > n: break
+                plen, = _NDEF_LEN32.unpack_from(mv, i); i += 4
             ilen = 0
-            if il:
-                ilen = msg[i]
-                i += 1
-            t = msg[i:i+tlen]; i += tlen
+            if hdr & 0x08:  # IL: ID length byte present
+                if i >= n: break
+                ilen = mv[i]; i += 1
+            t = bytes(mv[i:i+tlen]); i += tlen
             i += ilen
-            payload = msg[i:i+plen]; i += plen
-
-            tstr = t.decode(errors="ignore")
-            if tstr == "U" and payload:
-                prefs=["","http://www.","https://www.","http://","https://","tel:","mailto:",
-                       "ftp://anonymous:anonymous@","ftp://ftp.","ftps://","sftp://","smb://",
-                       "nfs://","ftp://","dav://","news:","telnet://","imap:","rtsp://","urn:",
-                       "pop:","sip:","sips:","tftp:","btspp://","btl2cap://","btgoep://","tcpobex://",
-                       "irdaobex://","file://","urn:epc:id:","urn:epc:tag:","urn:epc:pat:","urn:epc:raw:",
-                       "urn:epc:","urn:nfc:"]
-                prefix = prefs[payload[0]] if payload[0] < len(prefs) else ""
-                out.append(f"NDEF URI: {prefix}{payload[1:].decode(errors='ignore')}")
-            elif tstr == "T" and payload:
+            payload = bytes(mv[i:i+plen]); i += plen
+
+            # Compare the type as bytes; only the generic branch needs a str
+            if t == b"U" and payload:
+                out.append(f"NDEF URI: {Ntag21xWriter._decode_uri_payload(payload)}")
+            elif t == b"T" and payload:
                 st = payload[0]; lang_len = st & 0x3F
                 lang = payload[1:1+lang_len].decode(errors="ignore")
                 text = payload[1+lang_len:].decode(errors="ignore")
                 out.append(f'NDEF Text[{lang}]: "{text}"')
             else:
-                out.append(f"NDEF {tstr or t.hex()}: {payload.hex()}")
+                out.append(f"NDEF {t.decode(errors='ignore') or t.hex()}: {payload.hex()}")
 
             if hdr & 0x40:  # ME (end)
                 break
@@ -372,52 +579,38 @@ class Ntag21xWriter:
         capacity = cc2 * 8 if cc0 == 0xE1 else None
         return (cc0, cc1, cc2, cc3), capacity
 
-    @staticmethod
-    def _first_user_page() -> int:
-        return 4
-
     @staticmethod
     def _last_user_page_from_capacity(capacity_bytes: int) -> int:
-        # user bytes / 4 = pages; start at page 4
-        return 4 + (capacity_bytes // 4) - 1
+        # user bytes / 4 = pages (precomputed for NTAG215/216); only needed for
+        # caps that have not been checked against _VALID_CAPACITIES
+        last = _LAST_PAGE_BY_CAP.get(capacity_bytes)
+        return last if last is not None else _FIRST_USER_PAGE + (capacity_bytes // 4) - 1
 
     # ---------- Public API ----------
 
+    def write_pages_bulk(self, first_page: int, data: bytes) -> None:
+        """Write a 4-byte aligned buffer starting at first_page in one transport burst."""
+        self.t.write_pages(first_page, data)
+
     def write_url(self, url: str) -> List[str]:
         cc, cap = self._read_cc()
         if cc[0] != 0xE1:
             raise TagNotSupported("Tag is not NDEF-enabled (CC0 != 0xE1).")
-        if cap not in (496, 504, 872, 888):
+        if cap not in _VALID_CAPACITIES:
             raise CapacityError(f"Capacity {cap}B not NTAG215/216 (got {cap}).")
 
-        # Build a complete, contiguous TLV
-        ndef = self._ndef_uri_bytes(url)
-        use_ext = len(ndef) >= 0xFF
-        if use_ext:
-            tlv = bytearray(b"\x03\xff\x00\x00")
-            tlv[2] = (len(ndef) >> 8) & 0xFF
-            tlv[3] = (len(ndef) >> 0) & 0xFF
-        else:
-            tlv = bytearray([0x03, len(ndef)])
-        tlv += ndef
-        tlv += b"\xFE"  # terminator
-
-        # Pad only AFTER the terminator so we can write full pages
-        while len(tlv) % 4:
-            tlv += b"\x00"
-
-        first = 4
-        last = self._last_user_page_from_capacity(cap)
-
-        # Write sequentially, 4 bytes per page
-        for off in range(0, len(tlv), 4):
-            page = first + (off // 4)
-            if page > last:
-                raise NDEFWriterError("Out of user pages while writing TLV.")
-            self.t.write4(page, tlv[off:off+4])
-
-        # Verify
-        recs = self.verify()
+        # Build a complete, contiguous, page-padded TLV in one buffer
+        tlv = self._uri_tlv(url)
+
+        first = _FIRST_USER_PAGE
+        last = _LAST_PAGE_BY_CAP[cap]  # cap validated above
+
+        if first + len(tlv) // 4 - 1 > last:
+            raise NDEFWriterError("Out of user pages while writing TLV.")
+        self.write_pages_bulk(first, memoryview(tlv))
+
+        # Verify (CC already known: skip verify()'s own CC read)
+        recs = self._verify_with_cap(cap)
         if not recs:
             raise VerificationError("Wrote data but could not parse any NDEF records.")
         return recs
@@ -427,19 +620,19 @@ class Ntag21xWriter:
         cc, cap = self._read_cc()
         if cc[0] != 0xE1:
             return []
-        first = self._first_user_page()
+        return self._verify_with_cap(cap)
+
+    def _verify_with_cap(self, cap: int) -> List[str]:
+        """verify() for a tag whose CC was already read and found NDEF-enabled."""
+        first = _FIRST_USER_PAGE
         last  = self._last_user_page_from_capacity(cap)
 
-        # Read a reasonable window (first ~64 pages worth of 16B reads)
-        buf = bytearray()
+        # Read a reasonable window (~64 pages) with FAST_READ, not 16B at a time
         pages_to_scan = min(4 + (256 // 4), (last - first + 1))  # ~64 pages window
-        p = first
-        while pages_to_scan > 0 and p <= last:
-            buf += self.t.read16(p)
-            pages_to_scan -= 4
-            p += 4
+        buf = self.t.fast_read(first, first + pages_to_scan - 1)
 
-        # Parse TLV
+        # Parse TLV; V is a view into buf, the record parser copies only what it keeps
+        mv = memoryview(buf)
         i = 0; ndef = b""
         while i < len(buf):
             t = buf[i]; i += 1
@@ -451,9 +644,9 @@ class Ntag21xWriter:
             L = buf[i]; i += 1
             if L == 0xFF:
                 if i + 2 > len(buf): break
-                L = (buf[i] << 8) | buf[i+1]; i += 2
+                L, = _TLV_LEN16.unpack_from(buf, i); i += 2
             if i + L > len(buf): break
-            V = bytes(buf[i:i+L]); i += L
+            V = mv[i:i+L]; i += L
             if t == 0x03:
                 ndef = V; break
 
@@ -1,12 +1,48 @@
+import sys
+
 from smartcard.System import readers
+from smartcard.Exceptions import CardConnectionException
+
+
+class _Reader:
+    """
+    Connection to the first reader, opened on first use and shared by every
+    `with _Reader() as conn:` block after it (no PC/SC connect per run).
+    Dropped, and reopened on the next entry, only after a CardConnectionException.
+    """
+    _conn = None
+
+    def __enter__(self):
+        if _Reader._conn is None:
+            r = readers()
+            print("Readers:", r)
+            if not r:
+                raise RuntimeError("No smartcard readers found.")
+            conn = r[0].createConnection()
+            conn.connect()
+            print("Connected to reader:", r[0])
+            _Reader._conn = conn
+        return _Reader._conn
 
-r = readers()
-print("Readers:", r)
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, CardConnectionException):
+            try:
+                _Reader._conn.disconnect()
+            except Exception:
+                pass
+            _Reader._conn = None
+        return False
 
-if r:
-    connection = r[0].createConnection()
-    connection.connect()
-    print("Connected to reader:", r[0])
-else:
-    print("No smartcard readers found.")
 
+if __name__ == "__main__":
+    # Optional repeat count: `python test_nfc.py 10` checks the reader ten
+    # times over the one cached connection
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    for n in range(1, runs + 1):
+        try:
+            with _Reader() as connection:
+                print(f"Run {n}: {connection.getReader()} ATR={bytes(connection.getATR()).hex(' ').upper()}")
+        except RuntimeError as e:
+            sys.exit(str(e))
+        except CardConnectionException as e:
+            print(f"Run {n}: card connection failed ({e}); reconnecting on the next run")
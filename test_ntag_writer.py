@@ -0,0 +1,66 @@
+from ntag_writer import ACR1252Type2Transport, Ntag21xWriter
+
+
+class _FakeConn:
+    """Stands in for the pyscard connection: returns one canned reply."""
+
+    def __init__(self, resp):
+        self.resp = list(resp)
+
+    def transmit(self, apdu):
+        return self.resp, 0x90, 0x00
+
+
+def _acr(resp):
+    # Skip __init__: no PC/SC reader needed to exercise the DO walk
+    t = ACR1252Type2Transport.__new__(ACR1252Type2Transport)
+    t._conn = _FakeConn(resp)
+    t._in_session = 0
+    return t
+
+
+def test_do_walk_short_form():
+    data = bytes(range(16))
+    resp = bytes((0xC0, 0x03, 0x00, 0x90, 0x00, 0x92, 0x01, 0x00, 0x97, 0x10)) + data
+    assert _acr(resp)._transparent_exchange(b"\x30\x04") == data
+
+
+def test_do_walk_long_form_fast_read():
+    # 60-page FAST_READ: 240 bytes -> 97 81 F0 <240 bytes>
+    data = bytes(i & 0xFF for i in range(240))
+    resp = bytes((0xC0, 0x03, 0x00, 0x90, 0x00, 0x97, 0x81, 0xF0)) + data
+    t = _acr(resp)
+    assert t._transparent_exchange(b"\x3A\x04\x3F") == data
+    assert t.fast_read(4, 4 + 59) == data
+
+
+def _tlv_value(tlv):
+    """NDEF message inside a 0x03 TLV (1- or 3-byte length form)."""
+    assert tlv[0] == 0x03
+    if tlv[1] == 0xFF:
+        n = (tlv[2] << 8) | tlv[3]
+        return tlv[4:4 + n]
+    return tlv[2:2 + tlv[1]]
+
+
+def test_uri_round_trip_short_record():
+    uri = "https://example.com/pay?amount=1.5"
+    msg = _tlv_value(bytes(Ntag21xWriter._uri_tlv(uri)))
+    assert msg[0] == 0xD1  # MB|ME|SR, well-known
+    assert Ntag21xWriter._parse_ndef_records(msg) == [f"NDEF URI: {uri}"]
+
+
+def test_uri_round_trip_long_record():
+    # >255-byte payload: non-SR record with a 4-byte payload length
+    uri = "https://example.com/" + "a" * 300
+    msg = _tlv_value(bytes(Ntag21xWriter._uri_tlv(uri)))
+    assert msg[0] == 0xC1  # MB|ME, well-known, no SR
+    assert Ntag21xWriter._parse_ndef_records(msg) == [f"NDEF URI: {uri}"]
+
+
+if __name__ == "__main__":
+    test_do_walk_short_form()
+    test_do_walk_long_form_fast_read()
+    test_uri_round_trip_short_record()
+    test_uri_round_trip_long_record()
+    print("ok")
@@ -0,0 +1,13 @@
+# wsgi.py
+# Production entry point, e.g.:
+#   gunicorn -k gthread -w 1 --threads 16 -b 0.0.0.0:5000 wsgi:app
+#
+# Keep a single worker process (-w 1): the GPIO pins, the cached NFC
+# transport and the writer thread are process-global. Long-lived SSE
+# streams (/events) each hold one gthread thread, so size --threads for
+# the number of open dashboards plus a few for polls and POSTs. Not gevent:
+# the SPI/GPIO driver calls block the whole hub during a write.
+
+from kaspa_register import app, start_background
+
+start_background()